@@ -0,0 +1,72 @@
+"""
+Microbenchmark for depth stream decoding.
+
+Compares the python-binance path (full JSON decode, then float() on the
+best levels) with the schema-specific parser used by the raw stream.
+
+    python benchmarks/depth_decoding.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from market_data import parse_best_bid_ask
+
+
+def build_frames(count, depth=5):
+    frames = []
+    mid = 50000.0
+
+    for update_id in range(count):
+        mid += random.uniform(-5, 5)
+        bids = [[f"{mid - 0.01 * (i + 1):.8f}", f"{random.uniform(0, 2):.8f}"] for i in range(depth)]
+        asks = [[f"{mid + 0.01 * (i + 1):.8f}", f"{random.uniform(0, 2):.8f}"] for i in range(depth)]
+        frames.append(json.dumps(
+            {"lastUpdateId": update_id, "bids": bids, "asks": asks},
+            separators=(',', ':')
+        ))
+
+    return frames
+
+
+def decode_generic(frame):
+    res = json.loads(frame)
+    bids = res['bids']
+    asks = res['asks']
+    return (float(bids[0][0]) + float(asks[0][0])) / 2
+
+
+def decode_fast(frame):
+    best_bid, best_ask = parse_best_bid_ask(frame)
+    return (best_bid + best_ask) / 2
+
+
+def measure(decode, frames, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for frame in frames:
+            decode(frame)
+    duration = time.perf_counter() - start
+    return len(frames) * rounds / duration
+
+
+def main(count=10000, rounds=5, depth=5):
+    frames = build_frames(count, depth)
+
+    for frame in frames[:100]:
+        assert decode_generic(frame) == decode_fast(frame)
+
+    generic = measure(decode_generic, frames, rounds)
+    fast = measure(decode_fast, frames, rounds)
+
+    print(f"depth={depth} frames={count} rounds={rounds}")
+    print(f"generic json: {generic:,.0f} msgs/sec")
+    print(f"fast path:    {fast:,.0f} msgs/sec ({fast / generic:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(depth=int(sys.argv[1]) if len(sys.argv) > 1 else 5)
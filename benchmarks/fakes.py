@@ -0,0 +1,80 @@
+"""
+In-process stand-ins for the Redis and Postgres clients, so the hot paths
+can be benchmarked without the services. They only implement the calls
+made by RedisManager and Database.
+"""
+import bisect
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+
+    def ping(self):
+        return True
+
+    def flushall(self):
+        self.values.clear()
+        self.sorted_sets.clear()
+
+    def set(self, key, value):
+        self.values[key] = str(value)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def zadd(self, key, mapping):
+        entries = self.sorted_sets.setdefault(key, [])
+
+        for member, score in mapping.items():
+            bisect.insort(entries, (score, member))
+
+    def zrange(self, key, start, end, withscores=False):
+        entries = self.sorted_sets.get(key, [])
+        end = len(entries) if end == -1 else end + 1
+        selected = entries[start:end]
+
+        if withscores:
+            return [(member, score) for score, member in selected]
+        return [member for _, member in selected]
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.executed += 1
+
+    def mogrify(self, template, args):
+        return template % tuple(str(arg).encode() for arg in args)
+
+    def fetchall(self):
+        return []
+
+
+class FakeConnection:
+    encoding = 'UTF8'
+
+    def __init__(self):
+        self.executed = 0
+        self.commits = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import statistics
+import time
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(name, rounds):
+    """
+    Throughput is taken from the fastest round, which is the least affected
+    by noise from other processes. Percentiles cover every call.
+    """
+    latencies = [latency for samples in rounds for latency in samples]
+    best_round = min(sum(samples) / len(samples) for samples in rounds)
+
+    return {
+        "name": name,
+        "iterations": len(latencies),
+        "ops_per_sec": 1 / best_round if best_round > 0 else float('inf'),
+        "mean_us": statistics.fmean(latencies) * 1e6,
+        "p50_us": percentile(latencies, 50) * 1e6,
+        "p95_us": percentile(latencies, 95) * 1e6,
+        "p99_us": percentile(latencies, 99) * 1e6,
+    }
+
+
+def calibration_step(i):
+    # Fixed interpreter workload: arithmetic, dict writes and calls, like the hot paths
+    values = {}
+    total = 0.0
+
+    for j in range(100):
+        values[j & 15] = total
+        total += (i + j) * 0.5 / (1 + (j & 7))
+
+    return total
+
+
+async def measure(name, func, iterations, rounds=5, warmup=100, calibrate=False):
+    """
+    Call func iterations times, split over several rounds, and record the
+    latency of every call. func may be a coroutine function or a plain
+    function; it receives the iteration index so it can vary its input.
+
+    With calibrate, every call is preceded by a timed call of a fixed
+    calibration loop. A slowdown of the whole machine slows both alike,
+    so it cancels out of their ratio, the relative throughput.
+    """
+    is_async = asyncio.iscoroutinefunction(func)
+
+    for i in range(warmup):
+        if is_async:
+            await func(i)
+        else:
+            func(i)
+
+    perf_counter = time.perf_counter
+    per_round = max(1, iterations // rounds)
+    samples = []
+    ratios = []
+
+    for round_index in range(rounds):
+        latencies = []
+        calibration = 0.0
+
+        for i in range(round_index * per_round, (round_index + 1) * per_round):
+            if calibrate:
+                start = perf_counter()
+                calibration_step(i)
+                calibration += perf_counter() - start
+
+            start = perf_counter()
+            if is_async:
+                await func(i)
+            else:
+                func(i)
+            latencies.append(perf_counter() - start)
+
+        samples.append(latencies)
+
+        if calibrate:
+            ratios.append(calibration / sum(latencies))
+
+    result = summarize(name, samples)
+
+    if calibrate:
+        result["relative"] = statistics.median(ratios)
+
+    return result
+
+
+def relative_throughput(result):
+    """
+    Throughput in calibration loops: how many calls fit in the time of one loop.
+    """
+    return result["relative"]
+
+
+def median_of_runs(runs):
+    """
+    Combine repeated runs of the suite, keeping for every benchmark the run
+    with the median relative throughput.
+    """
+    combined = []
+
+    for results in zip(*runs):
+        ordered = sorted(results, key=relative_throughput)
+        combined.append(ordered[len(ordered) // 2])
+
+    return combined
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    # Keep entries of benchmarks that were not part of this run
+    baseline = load_baseline(path) or {}
+    baseline.update({result["name"]: result for result in results})
+
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def relative_change(result, reference):
+    return relative_throughput(result) / relative_throughput(reference) - 1
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Return the benchmarks whose relative throughput dropped more than
+    threshold (a fraction, e.g. 0.2 for 20%) below the baseline.
+    """
+    regressions = []
+
+    for result in results:
+        reference = baseline.get(result["name"])
+
+        if reference is None:
+            continue
+
+        change = relative_change(result, reference)
+
+        if change < -threshold:
+            regressions.append((result["name"], reference["ops_per_sec"], result["ops_per_sec"], change))
+
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':<40} {'ops/sec':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'vs base':>9}")
+
+    for result in results:
+        reference = (baseline or {}).get(result["name"])
+        change = f"{relative_change(result, reference):+.1%}" if reference else "-"
+
+        print(
+            f"{result['name']:<40} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>10.1f} "
+            f"{result['p95_us']:>10.1f} {result['p99_us']:>10.1f} {change:>9}"
+        )
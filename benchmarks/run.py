@@ -0,0 +1,177 @@
+"""
+Benchmark suite for the trading hot paths.
+
+Runs every benchmark, prints ops/sec and latency percentiles, and compares
+throughput with the stored baseline. Exits with status 1 when a benchmark
+is slower than the baseline by more than the threshold.
+
+    python benchmarks/run.py                    # in-process fakes
+    python benchmarks/run.py --backend local    # Redis/Postgres from .env
+    python benchmarks/run.py --update-baseline  # record a new baseline
+
+Baselines are machine-specific: record one on the machine that runs the gate.
+Every benchmark call is paired with a call of a fixed calibration loop, and
+throughput is compared relative to the loop: a slowdown of the whole machine,
+which moved raw results by 30-40% between runs, cancels out. Relative results
+stayed within about 12% between runs, so the default threshold is 20%. Another
+CPU-bound process on the same core still skews them by up to ~30%, so don't
+run the gate next to one. The suite is repeated with the median run kept.
+The local backend writes to the configured database and flushes Redis, so
+only point it at disposable services.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCHMARKS_DIR, '../src')))
+
+from config import Config
+from database import Database
+from indicators import IndicatorEngine, SMA, EMA, WMA, VWAP, BollingerBands
+from outbox import Outbox
+from redis_client import RedisManager
+from strategy import SMAStrategy
+from utils import monitor_operation
+
+from depth_decoding import build_frames, decode_generic, decode_fast
+from fakes import FakeConnection, FakeRedis
+from harness import measure, median_of_runs, load_baseline, save_baseline, find_regressions, print_results
+
+
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+SMA_WINDOWS = [Config.SHORT_TERM_PERIOD, Config.LONG_TERM_PERIOD, 200]
+PREFILLED_PRICES = 1000
+
+
+def build_resources(backend):
+    if backend == 'local':
+        return Database(), RedisManager()
+
+    database = Database.__new__(Database)
+    database.conn = FakeConnection()
+    redis = RedisManager.__new__(RedisManager)
+    redis.client = FakeRedis()
+    return database, redis
+
+
+def tick_price(i):
+    return 50000.0 + (i % 200) * 0.5
+
+
+async def run_benchmarks(backend, iterations, journal_dir, only=None):
+    database, redis = build_resources(backend)
+    outbox = Outbox(database, journal_path=os.path.join(journal_dir, 'outbox.journal'))
+    await outbox.start()
+    strategy = SMAStrategy(database, None, redis, outbox)
+    pair = Config.TRADING_PAIR
+
+    for i in range(PREFILLED_PRICES):
+        await redis.set_price(pair, tick_price(i))
+
+    async def set_price(i):
+        await redis.set_price(f"{pair}:bench", tick_price(i))
+
+    async def save_price(i):
+        await database.save_price(pair, tick_price(i))
+
+    async def process_price(i):
+        await strategy.process_price(f"{pair}:bench", tick_price(i))
+
+    def trade(i):
+        trade_id = outbox.begin_trade(pair, 'BUY', tick_price(i), 51000.0, 49000.0, 0.001)
+        outbox.complete_trade(trade_id, i, 0.001, 'FILLED')
+
+    async def bare(i):
+        return i
+
+    monitored = monitor_operation("benchmark")(bare)
+    frames = build_frames(1000)
+
+    engine = IndicatorEngine()
+    for window in SMA_WINDOWS:
+        engine.register(f"sma_{window}", SMA, period=window)
+    engine.register("ema", EMA, period=Config.LONG_TERM_PERIOD)
+    engine.register("wma", WMA, period=Config.LONG_TERM_PERIOD)
+    engine.register("vwap", VWAP, period=Config.LONG_TERM_PERIOD)
+    engine.register("bands", BollingerBands, period=Config.LONG_TERM_PERIOD)
+    batch = [tick_price(i) for i in range(100)]
+
+    events = [
+        {'event_id': f"bench-{i}", 'kind': 'trade', 'payload': {
+            'signal': {'timestamp': '2024-01-01T00:00:00', 'symbol': pair, 'signal_type': 'BUY', 'price': tick_price(i), 'short_sma': 51000.0, 'long_sma': 49000.0},
+            'order': {'order_id': i, 'symbol': pair, 'side': 'BUY', 'quantity': 0.001, 'price': tick_price(i), 'status': 'FILLED'},
+        }}
+        for i in range(Config.OUTBOX_BATCH_SIZE)
+    ]
+
+    benchmarks = [
+        ("redis.set_price", set_price),
+        ("database.save_price", save_price),
+        ("strategy.process_price", process_price),
+        ("utils.monitor_operation", monitored),
+        ("depth_decoding.generic", lambda i: decode_generic(frames[i % len(frames)])),
+        ("depth_decoding.fast", lambda i: decode_fast(frames[i % len(frames)])),
+        ("outbox.trade", trade),
+        (f"database.save_events[{len(events)}]", lambda i: database.save_events(events)),
+        ("indicators.update", lambda i: engine.update(pair, tick_price(i))),
+        ("indicators.update_batch[100]", lambda i: engine.update_batch(pair, batch)),
+    ]
+
+    for window in SMA_WINDOWS:
+        async def calculate_sma(i, window=window):
+            await redis.calculate_sma(pair, window)
+
+        benchmarks.append((f"redis.calculate_sma[{window}]", calculate_sma))
+
+    results = []
+
+    for name, func in benchmarks:
+        if only and only not in name:
+            continue
+        results.append(await measure(name, func, iterations, calibrate=True))
+
+    await outbox.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['fake', 'local'], default='fake')
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--repeats', type=int, default=3, help="suite repetitions, the median run is kept")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative throughput drop, as a fraction")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--only', help="run benchmarks whose name contains this string")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeats):
+        with tempfile.TemporaryDirectory() as journal_dir:
+            runs.append(asyncio.run(run_benchmarks(args.backend, args.iterations, journal_dir, args.only)))
+    results = median_of_runs(runs)
+    baseline = load_baseline(args.baseline)
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}, run with --update-baseline to record one")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+
+    for name, reference, current, change in regressions:
+        print(f"REGRESSION {name}: {reference:,.0f} -> {current:,.0f} ops/sec ({change:+.1%})")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
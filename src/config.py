@@ -11,6 +11,20 @@ class Config:
     TRADING_PAIR = 'BTCUSDT'
     DEPTH = '5'
     USE_TESTNET = True
+    # Read the depth stream from the raw websocket instead of python-binance
+    USE_RAW_DEPTH_STREAM = False
+
+    # REST rate limits, kept below Binance's 6000 weight/min and 100 orders/10s
+    REQUEST_WEIGHT_LIMIT = 5000
+    ORDER_COUNT_LIMIT = 80
+    REST_MAX_RETRIES = 5
+    REST_BACKOFF_BASE = 0.5
+    # Seconds before a request is abandoned, and milliseconds after its
+    # signed timestamp that the exchange still accepts it
+    REST_TIMEOUT = 10
+    REST_RECV_WINDOW = 5000
+    # Seconds an order may wait for rate limit budget before it is given up
+    ORDER_MAX_WAIT = 3
     
     # Strategy settings
     SHORT_TERM_PERIOD = 5
@@ -18,6 +32,11 @@ class Config:
     ORDER_QUANTITY = 0.001
     STRATEGY_TIME_INTERVAL = 30
 
+    # Signal/order outbox settings
+    OUTBOX_JOURNAL_PATH = os.getenv('OUTBOX_JOURNAL_PATH', 'outbox.journal')
+    OUTBOX_BATCH_SIZE = 100
+    OUTBOX_FLUSH_INTERVAL = 0.5
+
     # Database settings
     POSTGRES_HOST = os.getenv('POSTGRES_HOST')
     POSTGRES_DB = os.getenv('POSTGRES_DB')
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+
+from utils import STARTUP_DURATION
+
+
+class AppContainer:
+    """
+    Composition root for the application resources.
+
+    Each resource is built once, on first request, and concurrent requests
+    for the same resource share a single build. Modules with heavy imports
+    (psycopg2, redis, numpy, binance) are only imported when their resource
+    is built.
+    """
+    def __init__(self):
+        self._resources = {}
+
+    async def _resource(self, name, factory):
+        task = self._resources.get(name)
+
+        if task is None:
+            task = asyncio.ensure_future(self._build(name, factory))
+            self._resources[name] = task
+
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Drop the failed build so the next request retries it
+            if self._resources.get(name) is task:
+                del self._resources[name]
+            raise
+
+    async def _build(self, name, factory):
+        start_time = time.perf_counter()
+        resource = await factory()
+        duration = time.perf_counter() - start_time
+
+        STARTUP_DURATION.labels(resource=name).set(duration)
+        logging.info(f"Built {name} in {duration:.3f}s")
+        return resource
+
+    async def database(self):
+        async def factory():
+            from database import Database
+            return await asyncio.to_thread(Database)
+
+        return await self._resource('database', factory)
+
+    async def outbox_database(self):
+        # A connection of its own, so outbox transactions run on a worker
+        # thread without interleaving with price writes and reads. It is
+        # opened once the main connection has set up the schema.
+        async def factory():
+            from database import Database
+            await self.database()
+            return await asyncio.to_thread(Database, create_tables=False)
+
+        return await self._resource('outbox_database', factory)
+
+    async def redis(self):
+        async def factory():
+            from redis_client import RedisManager
+            return await asyncio.to_thread(RedisManager)
+
+        return await self._resource('redis', factory)
+
+    async def exchange(self):
+        async def factory():
+            from exchange import BinanceExchange
+            exchange = BinanceExchange()
+            await exchange.connect()
+            return exchange
+
+        return await self._resource('exchange', factory)
+
+    async def indicators(self):
+        async def factory():
+            from indicators import IndicatorEngine
+            return IndicatorEngine()
+
+        return await self._resource('indicators', factory)
+
+    async def outbox(self):
+        async def factory():
+            from outbox import Outbox
+            database, exchange = await asyncio.gather(self.outbox_database(), self.exchange())
+            outbox = Outbox(database, order_lookup=exchange.get_order)
+            await outbox.start()
+            return outbox
+
+        return await self._resource('outbox', factory)
+
+    async def strategy(self):
+        async def factory():
+            from strategy import SMAStrategy
+            database, exchange, redis, outbox, indicators = await asyncio.gather(
+                self.database(),
+                self.exchange(),
+                self.redis(),
+                self.outbox(),
+                self.indicators()
+            )
+            return SMAStrategy(database, exchange, redis, outbox, indicators)
+
+        return await self._resource('strategy', factory)
+
+    async def readiness(self):
+        """
+        Run the readiness check of every resource concurrently.
+        Resources that have not been built yet are reported as not ready.
+        """
+        names = ['database', 'redis', 'exchange']
+        checks = await asyncio.gather(
+            *(self._check(name) for name in names),
+            return_exceptions=True
+        )
+
+        return {
+            name: result is True
+            for name, result in zip(names, checks)
+        }
+
+    def _built(self, name):
+        task = self._resources.get(name)
+
+        if task is None or not task.done() or task.cancelled() or task.exception() is not None:
+            return None
+
+        return task.result()
+
+    async def _check(self, name):
+        resource = self._built(name)
+
+        if resource is None:
+            return False
+
+        await resource.ping()
+        return True
+
+    async def close(self):
+        # The outbox flushes its pending trades, so it closes before its database
+        for name in ['exchange', 'outbox', 'redis', 'outbox_database', 'database']:
+            resource = self._built(name)
+            self._resources.pop(name, None)
+
+            if resource is None:
+                continue
+
+            try:
+                await resource.close()
+            except Exception as e:
+                logging.error(f"Error closing {name}: {e}")
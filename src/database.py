@@ -1,17 +1,20 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from config import Config
 from datetime import datetime
 
 class Database:
-    def __init__(self):
+    def __init__(self, create_tables: bool = True):
         self.conn = psycopg2.connect(
             host=Config.POSTGRES_HOST,
             database=Config.POSTGRES_DB,
             user=Config.POSTGRES_USER,
             password=Config.POSTGRES_PASSWORD
         )
-        self.create_tables()
+
+        # Only one connection runs the schema setup, concurrent DDL on an empty database conflicts
+        if create_tables:
+            self.create_tables()
     
     def create_tables(self):
         with self.conn.cursor() as cur:
@@ -54,8 +57,19 @@ class Database:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+
+            # Outbox event ids make replayed signal and order inserts idempotent
+            cur.execute("ALTER TABLE orders ADD COLUMN IF NOT EXISTS event_id VARCHAR(32) UNIQUE")
+            cur.execute("ALTER TABLE signals ADD COLUMN IF NOT EXISTS event_id VARCHAR(32) UNIQUE")
         self.conn.commit()
 
+    async def ping(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT 1")
+
+    async def close(self):
+        self.conn.close()
+
     async def select(self, _columns = "*", _from = "", _limit = "", return_single=False):
 
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -80,19 +94,38 @@ class Database:
         self.conn.commit()
 
 
-    async def save_signal(self, symbol: str, signal_type: str, price: float, short_sma: float, long_sma: float):
-        with self.conn.cursor() as cur:
-            cur.execute(
-                "INSERT INTO signals (timestamp, symbol, signal_type, price, short_sma, long_sma) VALUES (%s, %s, %s, %s, %s, %s)",
-                (datetime.now(), symbol, signal_type, price, short_sma, long_sma)
-            )
-        self.conn.commit()
-
+    def save_events(self, events: list):
+        """
+        Write a batch of outbox trades, each a signal and its order, in a
+        single transaction. Trades that were already written are skipped.
+        Blocking, the outbox runs it on a worker thread.
+        """
+        signals = [
+            (e['event_id'], s['timestamp'], s['symbol'], s['signal_type'], s['price'], s['short_sma'], s['long_sma'])
+            for e in events
+            for s in [e['payload']['signal']]
+        ]
+        orders = [
+            (e['event_id'], o['order_id'], o['symbol'], o['side'], o['quantity'], o['price'], o['status'])
+            for e in events
+            for o in [e['payload']['order']]
+        ]
 
-    async def save_order(self, order_id: int, symbol: str, side: str, quantity: float, price: float, status: str):
-        with self.conn.cursor() as cur:
-            cur.execute(
-                "INSERT INTO orders (order_id, symbol, side, quantity, price, status) VALUES (%s, %s, %s, %s, %s, %s)",
-                (order_id, symbol, side, quantity, price, status)
-            )
-        self.conn.commit()
\ No newline at end of file
+        try:
+            with self.conn.cursor() as cur:
+                if signals:
+                    execute_values(
+                        cur,
+                        "INSERT INTO signals (event_id, timestamp, symbol, signal_type, price, short_sma, long_sma) VALUES %s ON CONFLICT (event_id) DO NOTHING",
+                        signals
+                    )
+                if orders:
+                    execute_values(
+                        cur,
+                        "INSERT INTO orders (event_id, order_id, symbol, side, quantity, price, status) VALUES %s ON CONFLICT (event_id) DO NOTHING",
+                        orders
+                    )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
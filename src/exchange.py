@@ -1,14 +1,26 @@
 import logging
-from binance import BinanceSocketManager
 from binance import AsyncClient, BinanceSocketManager
 
 from config import Config
+from market_data import RawDepthStream
+from rest_client import BinanceRestClient
 from utils import monitor_operation
 
 
 class BinanceExchange:
-    def __init__(self, price_callback):
-        self.client = AsyncClient(
+    def __init__(self):
+        self.client = None
+        self.rest = None
+        self.bm = None
+        self.depth_ts = None
+        self.price_callback = None
+
+    async def connect(self):
+        """
+        Create the Binance client. AsyncClient.create pings the API, so a
+        returned client is known to be reachable.
+        """
+        self.client = await AsyncClient.create(
             Config.BINANCE_API_KEY, 
             Config.BINANCE_API_SECRET,
             testnet=Config.USE_TESTNET
@@ -16,10 +28,24 @@ class BinanceExchange:
         self.bm = BinanceSocketManager(self.client)
         self.depth_ts = self.bm.depth_socket(Config.TRADING_PAIR, Config.DEPTH)
 
+        self.rest = BinanceRestClient(Config.BINANCE_API_KEY, Config.BINANCE_API_SECRET)
+        await self.rest.connect()
+
+    async def ping(self):
+        await self.rest.ping()
+
+    async def close(self):
+        await self.rest.close()
+        await self.client.close_connection()
+
+    async def start(self, price_callback):
         self.price_callback = price_callback
 
-    async def start(self):
-        await self.handle_order_book_message()
+        if Config.USE_RAW_DEPTH_STREAM:
+            stream = RawDepthStream(Config.TRADING_PAIR, Config.DEPTH, self.price_callback)
+            await stream.start()
+        else:
+            await self.handle_order_book_message()
 
     async def handle_order_book_message(self):
         try:
@@ -31,24 +57,17 @@ class BinanceExchange:
 
                     mid_price = (float(bids[0][0]) + float(asks[0][0])) / 2
                     await self.price_callback(Config.TRADING_PAIR, mid_price)
-
-            await self.client.close_connection()
         except Exception as e:
             logging.error(f"Error processing message: {e}")
 
     @monitor_operation('create_market_order')
-    async def create_market_order(self, symbol: str, side: str, quantity: float):
+    async def create_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = None):
         """
-        Create market order.
+        Create market order through the rate-limited REST client.
+        Errors are raised so the caller can tell a rejected order from one
+        whose outcome is unknown.
         """
-        try:
-            order = await self.client.create_order(
-                symbol=symbol,
-                side=side,
-                type='MARKET',
-                quantity=quantity
-            )
-            return order
-        except Exception as e:
-            logging.error(f"Market order creation error: {e}")
-            return None 
\ No newline at end of file
+        return await self.rest.create_market_order(symbol, side, quantity, client_order_id)
+
+    async def get_order(self, symbol: str, client_order_id: str):
+        return await self.rest.get_order(symbol, client_order_id) 
\ No newline at end of file
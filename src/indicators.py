@@ -0,0 +1,384 @@
+import logging
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class PriceWindow:
+    """
+    Ring buffer holding the latest prices and volumes of one symbol.
+    Shared by every indicator registered for the symbol.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.prices = [0.0] * size
+        self.volumes = [0.0] * size
+        self.count = 0
+
+    def append(self, price: float, volume: float):
+        index = self.count % self.size
+        self.prices[index] = price
+        self.volumes[index] = volume
+        self.count += 1
+
+    def leaving(self, period: int):
+        """
+        Return the (price, volume) that drops out of a window of the given
+        period when the next tick is appended, or None while it is filling.
+        """
+        if self.count < period:
+            return None
+
+        index = (self.count - period) % self.size
+        return self.prices[index], self.volumes[index]
+
+    def tail(self, n: int):
+        """
+        Return the latest n prices and volumes, oldest first.
+        """
+        n = min(n, self.count, self.size)
+        indices = [(self.count - n + i) % self.size for i in range(n)]
+        return [self.prices[i] for i in indices], [self.volumes[i] for i in indices]
+
+    def resize(self, size: int):
+        prices, volumes = self.tail(size)
+        self.size = size
+        self.prices = prices + [0.0] * (size - len(prices))
+        self.volumes = volumes + [0.0] * (size - len(volumes))
+        self.count = len(prices)
+
+
+class Indicator(ABC):
+    """
+    Base class for incrementally updated indicators.
+
+    update() is called once per tick, before the tick is appended to the
+    window, and must run in O(1). update_batch() receives several ticks at
+    once, also before they are appended, and may recompute its state from
+    the window history with numpy.
+    """
+    period = 1
+
+    def __init__(self):
+        self.ticks = 0
+
+    @property
+    def ready(self):
+        return self.ticks >= self.period
+
+    @abstractmethod
+    def update(self, price: float, volume: float, window: PriceWindow):
+        pass
+
+    @abstractmethod
+    def update_batch(self, prices: np.ndarray, volumes: np.ndarray, window: PriceWindow):
+        pass
+
+    @abstractmethod
+    def value(self):
+        pass
+
+
+class WindowedIndicator(Indicator):
+    """
+    Indicator over the last `period` ticks, kept as running sums.
+
+    Per-tick updates add the new tick and remove the one leaving the window.
+    Every `rebuild_interval` ticks, and on batch updates, the sums are rebuilt
+    from the window with numpy so floating point drift stays bounded.
+    """
+    rebuild_interval = 1000
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+
+    def update(self, price, volume, window):
+        self.step(price, volume, window.leaving(self.period), window)
+        self.ticks += 1
+
+        if self.ticks % self.rebuild_interval == 0:
+            history_prices, history_volumes = window.tail(self.period - 1)
+            self.rebuild(
+                np.asarray(history_prices + [price], dtype=float),
+                np.asarray(history_volumes + [volume], dtype=float)
+            )
+
+    def update_batch(self, prices: np.ndarray, volumes: np.ndarray, window: PriceWindow):
+        history_prices, history_volumes = window.tail(self.period)
+        series = np.concatenate([np.asarray(history_prices, dtype=float), prices])[-self.period:]
+        series_volumes = np.concatenate([np.asarray(history_volumes, dtype=float), volumes])[-self.period:]
+
+        self.ticks += len(prices)
+        self.rebuild(series, series_volumes)
+
+    @abstractmethod
+    def step(self, price: float, volume: float, leaving, window: PriceWindow):
+        """
+        Apply one tick in O(1); leaving is the (price, volume) dropping out
+        of the window, or None while it is filling.
+        """
+
+    @abstractmethod
+    def rebuild(self, prices: np.ndarray, volumes: np.ndarray):
+        pass
+
+
+class SMA(WindowedIndicator):
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.total = 0.0
+
+    def step(self, price, volume, leaving, window):
+        self.total += price - (leaving[0] if leaving else 0.0)
+
+    def rebuild(self, prices, volumes):
+        self.total = float(prices.sum())
+
+    def value(self):
+        return self.total / self.period if self.ready else None
+
+
+class WMA(WindowedIndicator):
+    """
+    Linearly weighted moving average, the latest price has weight `period`.
+    """
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.total = 0.0
+        self.weighted_total = 0.0
+
+    def step(self, price, volume, leaving, window):
+        if leaving is None:
+            # Still filling: the new price takes the next weight
+            self.weighted_total += (window.count + 1) * price
+            self.total += price
+        else:
+            # Every weight drops by one, which removes the leaving price entirely
+            self.weighted_total += self.period * price - self.total
+            self.total += price - leaving[0]
+
+    def rebuild(self, prices, volumes):
+        self.total = float(prices.sum())
+        self.weighted_total = float(np.dot(np.arange(1, len(prices) + 1), prices))
+
+    def value(self):
+        if not self.ready:
+            return None
+        return self.weighted_total / (self.period * (self.period + 1) / 2)
+
+
+class VWAP(WindowedIndicator):
+    """
+    Volume weighted average price over the last `period` ticks.
+    """
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.notional = 0.0
+        self.volume = 0.0
+
+    def step(self, price, volume, leaving, window):
+        if leaving:
+            self.notional -= leaving[0] * leaving[1]
+            self.volume -= leaving[1]
+
+        self.notional += price * volume
+        self.volume += volume
+
+    def rebuild(self, prices, volumes):
+        self.notional = float(np.dot(prices, volumes))
+        self.volume = float(volumes.sum())
+
+    def value(self):
+        if not self.ready or self.volume <= 0:
+            return None
+        return self.notional / self.volume
+
+
+class BollingerBands(WindowedIndicator):
+    """
+    SMA middle band with upper and lower bands `width` standard deviations away.
+
+    The sums are kept relative to a shift price close to the window, since
+    sums of squared raw prices lose the variance to cancellation. Rebuilds
+    move the shift to the oldest price in the window.
+    """
+    def __init__(self, period: int, width: float = 2.0):
+        super().__init__(period)
+        self.width = width
+        self.shift = None
+        self.total = 0.0
+        self.squares = 0.0
+
+    def step(self, price, volume, leaving, window):
+        if self.shift is None:
+            self.shift = price
+
+        if leaving:
+            deviation = leaving[0] - self.shift
+            self.total -= deviation
+            self.squares -= deviation * deviation
+
+        deviation = price - self.shift
+        self.total += deviation
+        self.squares += deviation * deviation
+
+    def rebuild(self, prices, volumes):
+        self.shift = float(prices[0])
+        deviations = prices - self.shift
+        self.total = float(deviations.sum())
+        self.squares = float(np.dot(deviations, deviations))
+
+    def value(self):
+        if not self.ready:
+            return None
+
+        mean_deviation = self.total / self.period
+        middle = self.shift + mean_deviation
+        variance = max(self.squares / self.period - mean_deviation * mean_deviation, 0.0)
+        offset = self.width * variance ** 0.5
+        return {'middle': middle, 'upper': middle + offset, 'lower': middle - offset}
+
+
+class EMA(Indicator):
+    """
+    Exponential moving average, seeded with the first price.
+    """
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.current = None
+
+    def update(self, price, volume, window):
+        if self.current is None:
+            self.current = price
+        else:
+            self.current += self.alpha * (price - self.current)
+        self.ticks += 1
+
+    def update_batch(self, prices, volumes, window):
+        if self.current is None:
+            self.current = float(prices[0])
+
+        # Closed form of len(prices) recursive steps
+        decay = (1 - self.alpha) ** np.arange(len(prices) - 1, -1, -1)
+        self.current = float((1 - self.alpha) ** len(prices) * self.current + self.alpha * np.dot(decay, prices))
+        self.ticks += len(prices)
+
+    def value(self):
+        return self.current if self.ready else None
+
+
+class IndicatorEngine:
+    """
+    Keeps one price window per symbol and updates every registered indicator
+    in a single pass per tick, then publishes their values to subscribers.
+    """
+    def __init__(self, batch_threshold: int = 32):
+        self.batch_threshold = batch_threshold
+        self.specs = {}
+        self.windows = {}
+        self.indicators = {}
+        self.subscribers = []
+
+    def register(self, name: str, indicator_type, **params):
+        """
+        Register an indicator for every symbol, e.g. register("sma_5", SMA, period=5).
+        Symbols that already have history get the indicator seeded from their window.
+        """
+        if name in self.specs:
+            return
+
+        self.specs[name] = (indicator_type, params, indicator_type(**params).period)
+        size = self._window_size()
+
+        for symbol, window in self.windows.items():
+            if window.size < size:
+                window.resize(size)
+
+            indicator = indicator_type(**params)
+            self._seed(indicator, window)
+            self.indicators[symbol][name] = indicator
+
+    def subscribe(self, callback):
+        """
+        Call callback(symbol, values) after every update, where values maps
+        indicator names to their latest value (None while warming up).
+        """
+        self.subscribers.append(callback)
+
+    def _window_size(self):
+        return max([period for _, _, period in self.specs.values()] + [1])
+
+    def _seed(self, indicator, window):
+        prices, volumes = window.tail(window.size)
+        if not prices:
+            return
+
+        # Replay the history as one batch on top of an empty window
+        indicator.update_batch(np.asarray(prices, dtype=float), np.asarray(volumes, dtype=float), PriceWindow(window.size))
+
+    def _symbol(self, symbol):
+        indicators = self.indicators.get(symbol)
+
+        if indicators is None:
+            self.windows[symbol] = PriceWindow(self._window_size())
+            indicators = {
+                name: indicator_type(**params)
+                for name, (indicator_type, params, _) in self.specs.items()
+            }
+            self.indicators[symbol] = indicators
+
+        return self.windows[symbol], indicators
+
+    def update(self, symbol: str, price: float, volume: float = 1.0):
+        window, indicators = self._symbol(symbol)
+
+        for indicator in indicators.values():
+            indicator.update(price, volume, window)
+
+        window.append(price, volume)
+        self._publish(symbol, indicators)
+
+    def update_batch(self, symbol: str, prices, volumes=None):
+        """
+        Apply several ticks at once with vectorized indicator updates.
+        """
+        window, indicators = self._symbol(symbol)
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.ones_like(prices) if volumes is None else np.asarray(volumes, dtype=float)
+
+        if not len(prices):
+            return
+
+        if len(prices) < self.batch_threshold:
+            # numpy's fixed overhead outweighs the per-tick loop for small batches
+            for price, volume in zip(prices.tolist(), volumes.tolist()):
+                for indicator in indicators.values():
+                    indicator.update(price, volume, window)
+                window.append(price, volume)
+        else:
+            for indicator in indicators.values():
+                indicator.update_batch(prices, volumes, window)
+
+            for price, volume in zip(prices.tolist(), volumes.tolist()):
+                window.append(price, volume)
+
+        self._publish(symbol, indicators)
+
+    def values(self, symbol: str):
+        indicators = self.indicators.get(symbol, {})
+        return {name: indicator.value() for name, indicator in indicators.items()}
+
+    def _publish(self, symbol, indicators):
+        if not self.subscribers:
+            return
+
+        values = {name: indicator.value() for name, indicator in indicators.items()}
+
+        for callback in self.subscribers:
+            try:
+                callback(symbol, values)
+            except Exception as e:
+                logging.error(f"Indicator subscriber error: {e}")
@@ -1,8 +1,11 @@
+import time
+
+_import_start_time = time.perf_counter()
+
 import asyncio
 import logging
 import uvicorn
 import os
-import signal
 
 from fastapi import FastAPI, Request
 from datetime import datetime
@@ -10,12 +13,10 @@ from prometheus_client import start_http_server
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 
-from exchange import BinanceExchange
-from database import Database
-from utils import OPERATION_LATENCY, OPERATION_ERRORS, CPU_USAGE, MEMORY_USAGE, DATA_LOSS_COUNTER
-from strategy import SMAStrategy
-from redis_client import RedisManager
+from container import AppContainer
+from utils import OPERATION_LATENCY, OPERATION_ERRORS, CPU_USAGE, MEMORY_USAGE, DATA_LOSS_COUNTER, STARTUP_DURATION, IMPORT_DURATION
 
+IMPORT_DURATION.labels(module="main").set(time.perf_counter() - _import_start_time)
 
 
 logging.basicConfig(level=logging.INFO)
@@ -28,7 +29,8 @@ template_dir = os.path.join(BASE_DIR, "templates")
 
 operations = ["process_price", "sma_calculation", "generate_signal", "create_market_order"]
 
-db = Database()
+# Resources are built on first use, not at import time
+container = AppContainer()
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -45,6 +47,7 @@ async def home(request: Request):
 @app.get("/signals", response_class=HTMLResponse)
 async def signals(request: Request):
 
+    db = await container.database()
     signals = await db.select(_columns='*', _from="signals")
     formatted_signals = []
 
@@ -75,6 +78,7 @@ async def signals(request: Request):
 @app.get("/orders", response_class=HTMLResponse)
 async def orders(request: Request):
 
+    db = await container.database()
     orders = await db.select(_columns='*', _from="orders")
     formatted_orders = []
 
@@ -161,12 +165,37 @@ async def get_error_metrics():
         "data_loss": data_loss
     }
 
+@app.get("/api/monitoring/startup")
+async def get_startup_metrics():
+    """Get readiness and startup/import times of application resources"""
+    startup = {}
+
+    for metric in [STARTUP_DURATION, IMPORT_DURATION]:
+        for sample in metric.collect()[0].samples:
+            label = sample.labels.get("resource") or sample.labels.get("module")
+            startup[f"{sample.name}:{label}"] = sample.value
+
+    return {
+        "ready": await container.readiness(),
+        "startup": startup
+    }
+
 class TradingApp:
-    def __init__(self):
-        self.database = Database()
-        self.exchange = BinanceExchange(self.process_price)
-        self.redis = RedisManager()
-        self.strategy = SMAStrategy(self.database, self.exchange, self.redis)
+    def __init__(self, container: AppContainer):
+        self.container = container
+        self.exchange = None
+        self.strategy = None
+
+    async def setup(self):
+        """
+        Build the exchange and strategy along with their dependencies concurrently.
+        """
+        start_time = time.perf_counter()
+        self.exchange, self.strategy = await asyncio.gather(
+            self.container.exchange(),
+            self.container.strategy()
+        )
+        STARTUP_DURATION.labels(resource="total").set(time.perf_counter() - start_time)
 
 
     async def process_price(self, symbol: str, price: float):
@@ -177,7 +206,7 @@ class TradingApp:
 
     async def start(self):
         try:
-            await self.exchange.start()
+            await self.exchange.start(self.process_price)
         except Exception as e:
             logger.error(f"Application error: {e}")
 
@@ -190,19 +219,29 @@ class TradingApp:
                 logging.error(f"Strategy error: {e}")
                 await asyncio.sleep(5)
 
+    async def run(self):
+        await self.setup()
+        await asyncio.gather(
+            self.start(),
+            self.run_strategy()
+        )
+
     async def main(self):
-        trading_app = TradingApp()
         start_http_server(8000)  # Prometheus metrics endpoint
     
         config = uvicorn.Config(app, host="0.0.0.0", port=8080, loop="asyncio")
         server = uvicorn.Server(config)
     
-        await asyncio.gather(
-            trading_app.start(),
-            trading_app.run_strategy(),
-            server.serve()
-        )
+        try:
+            # The dashboard starts serving while the trading resources are still being built
+            await asyncio.gather(
+                self.run(),
+                server.serve()
+            )
+        finally:
+            await self.container.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(TradingApp().main()) 
+    asyncio.run(TradingApp(container).main())
+
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import logging
+
+import aiohttp
+
+from config import Config
+
+
+STREAM_URL = 'wss://stream.binance.com:9443/ws/'
+STREAM_TESTNET_URL = 'wss://testnet.binance.vision/ws/'
+
+_BIDS_KEY = '"bids":[["'
+_ASKS_KEY = '"asks":[["'
+
+
+def parse_best_bid_ask(frame: str):
+    """
+    Extract the best bid and ask prices from a raw partial depth frame.
+
+    Only the first price level of each side is read, so the rest of the
+    book is never decoded. Falls back to full JSON decoding when the frame
+    does not have the expected layout. Returns None if a side is empty.
+    """
+    bid_start = frame.find(_BIDS_KEY)
+    ask_start = frame.find(_ASKS_KEY, bid_start + 1)
+
+    if bid_start == -1 or ask_start == -1:
+        return _parse_best_bid_ask_json(frame)
+
+    bid_start += len(_BIDS_KEY)
+    ask_start += len(_ASKS_KEY)
+    bid_end = frame.find('"', bid_start)
+    ask_end = frame.find('"', ask_start)
+
+    if bid_end == -1 or ask_end == -1:
+        return _parse_best_bid_ask_json(frame)
+
+    return float(frame[bid_start:bid_end]), float(frame[ask_start:ask_end])
+
+
+def _parse_best_bid_ask_json(frame: str):
+    message = json.loads(frame)
+
+    # Combined streams wrap the payload in a {"stream": ..., "data": ...} envelope
+    message = message.get('data', message)
+    bids = message.get('bids')
+    asks = message.get('asks')
+
+    if not bids or not asks:
+        return None
+
+    return float(bids[0][0]), float(asks[0][0])
+
+
+class RawDepthStream:
+    """
+    Partial depth stream read straight from the websocket.
+
+    Bypasses python-binance's message queue and generic JSON decoding and
+    hands the mid price of every frame to the price callback.
+    """
+    def __init__(self, symbol: str, depth: str, price_callback, testnet: bool = Config.USE_TESTNET):
+        base_url = STREAM_TESTNET_URL if testnet else STREAM_URL
+        self.url = f"{base_url}{symbol.lower()}@depth{depth}"
+        self.symbol = symbol
+        self.price_callback = price_callback
+        self.reconnect_delay = 1
+
+    async def start(self):
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    await self._consume(session)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logging.error(f"Depth stream connection error: {e}")
+
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _consume(self, session: aiohttp.ClientSession):
+        # Bind hot attributes to locals once per connection instead of per frame
+        symbol = self.symbol
+        price_callback = self.price_callback
+        text_type = aiohttp.WSMsgType.TEXT
+
+        async with session.ws_connect(self.url, heartbeat=30) as ws:
+            async for msg in ws:
+                if msg.type != text_type:
+                    if msg.type == aiohttp.WSMsgType.ERROR:
+                        break
+                    continue
+
+                try:
+                    best = parse_best_bid_ask(msg.data)
+                except ValueError as e:
+                    logging.error(f"Error decoding depth frame: {e}")
+                    continue
+
+                if best is None:
+                    continue
+
+                await price_callback(symbol, (best[0] + best[1]) / 2)
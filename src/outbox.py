@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+
+from config import Config
+from database import Database
+
+
+class Outbox:
+    """
+    Transactional outbox for trades: a signal and the order placed for it.
+
+    A trade is journaled as an intent before its order is placed, and its
+    event id doubles as the order's client order id. Once the outcome is
+    known the trade is queued in memory and written to the database in
+    batches, one transaction and one commit per batch, off the event loop.
+    Callers get a future that resolves once their trade is committed.
+
+    On startup, completed trades that were never acknowledged are replayed,
+    and intents without an outcome are looked up on the exchange by their
+    client order id. Inserts are keyed by event id, so replaying an already
+    committed trade is a no-op.
+    """
+    # The grace period starts when the order is deferred, after its request
+    # failed or timed out, or when recovery finds it. By then the request was
+    # sent with a signed timestamp, and Binance drops it once it is older
+    # than recvWindow, so an order still unknown after this was never placed.
+    lookup_grace = Config.REST_TIMEOUT + Config.REST_RECV_WINDOW / 1000
+    # A single "not found" is never enough to record an order as FAILED
+    lookup_attempts = 2
+    lookup_interval = 5
+
+    def __init__(self, database: Database, journal_path: str = None, order_lookup=None):
+        self.database = database
+        self.journal_path = journal_path or Config.OUTBOX_JOURNAL_PATH
+        self.order_lookup = order_lookup
+        self.batch_size = Config.OUTBOX_BATCH_SIZE
+        self.flush_interval = Config.OUTBOX_FLUSH_INTERVAL
+        self.pending = []
+        self.open_trades = {}
+        # Trades whose order may or may not have been placed, by event id
+        self.in_doubt = {}
+        self.acks = {}
+        self.journal = None
+        self._closing = False
+        self._flush_lock = None
+        self._wakeup = None
+        self._task = None
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._recover()
+        self.journal = open(self.journal_path, 'a')
+
+        if self.pending or self.in_doubt:
+            logging.info(f"Recovering {len(self.pending)} unacknowledged and {len(self.in_doubt)} unresolved outbox trades")
+            await self.resolve_in_doubt()
+            await self.flush()
+
+        self._task = asyncio.ensure_future(self.run())
+
+    async def close(self):
+        # Let the running flush finish instead of cancelling it mid-transaction
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+
+        await self.flush()
+        self.journal.close()
+
+    def _recover(self):
+        if not os.path.exists(self.journal_path):
+            return
+
+        events = {}
+        acknowledged = set()
+
+        with open(self.journal_path) as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave the last line half written
+                    logging.warning("Skipping unreadable outbox journal entry")
+                    continue
+
+                if 'ack' in entry:
+                    acknowledged.update(entry['ack'])
+                elif 'outcome' in entry:
+                    if entry['outcome'] in events:
+                        events[entry['outcome']]['payload']['order'].update(entry['order'])
+                        events[entry['outcome']]['complete'] = True
+                else:
+                    events[entry['event_id']] = entry
+
+        for event_id, event in events.items():
+            if event_id in acknowledged:
+                continue
+
+            if event.pop('complete', False):
+                self.pending.append(event)
+            else:
+                self.open_trades[event_id] = event
+                self._doubt(event_id)
+
+    def _write(self, entry: dict):
+        # default=str keeps Decimal prices read from the database exact
+        self.journal.write(json.dumps(entry, default=str) + '\n')
+        self.journal.flush()
+
+    def begin_trade(self, symbol: str, signal_type: str, price: float, short_sma: float, long_sma: float, quantity: float):
+        """
+        Journal a signal and the intent to place its order.
+        Returns the event id, to be sent as the order's client order id.
+        """
+        event = {
+            'event_id': uuid.uuid4().hex,
+            'kind': 'trade',
+            'payload': {
+                'signal': {
+                    'timestamp': datetime.now().isoformat(),
+                    'symbol': symbol,
+                    'signal_type': signal_type,
+                    'price': price,
+                    'short_sma': short_sma,
+                    'long_sma': long_sma,
+                },
+                'order': {
+                    'order_id': None,
+                    'symbol': symbol,
+                    'side': signal_type,
+                    'quantity': quantity,
+                    'price': price,
+                    'status': None,
+                },
+            },
+        }
+
+        self._write(event)
+        self.open_trades[event['event_id']] = event
+        return event['event_id']
+
+    def complete_trade(self, event_id: str, order_id, quantity: float, status: str):
+        """
+        Journal the outcome of a trade's order and queue the trade for writing.
+        Returns a future resolved once the trade is committed, or None if the
+        trade was already completed.
+        """
+        event = self.open_trades.pop(event_id, None)
+        if event is None:
+            return None
+
+        self.in_doubt.pop(event_id, None)
+        outcome = {'order_id': order_id, 'quantity': quantity, 'status': status}
+        self._write({'outcome': event_id, 'order': outcome})
+        event['payload']['order'].update(outcome)
+        self.pending.append(event)
+
+        ack = asyncio.get_running_loop().create_future()
+        self.acks[event_id] = ack
+
+        if len(self.pending) >= self.batch_size:
+            self._wakeup.set()
+
+        return ack
+
+    def defer_trade(self, event_id: str):
+        """
+        Leave the outcome of a trade to be looked up on the exchange, e.g.
+        when the order request failed without an answer.
+        """
+        if event_id in self.open_trades:
+            self._doubt(event_id)
+
+    def _doubt(self, event_id: str):
+        if event_id not in self.in_doubt:
+            self.in_doubt[event_id] = {'since': time.time(), 'not_found': 0, 'checked_at': None}
+
+    async def resolve_in_doubt(self):
+        """
+        Look up the orders of trades in doubt by client order id. An order
+        is recorded as FAILED only after lookup_attempts lookups found
+        nothing, the last of them past the grace period.
+        """
+        if self.order_lookup is None:
+            return
+
+        for event_id, doubt in list(self.in_doubt.items()):
+            event = self.open_trades.get(event_id)
+
+            if event is None:
+                self.in_doubt.pop(event_id, None)
+                continue
+
+            checked_at = time.time()
+
+            if doubt['checked_at'] is not None and checked_at - doubt['checked_at'] < self.lookup_interval:
+                continue
+
+            order = event['payload']['order']
+
+            try:
+                placed = await self.order_lookup(order['symbol'], event_id)
+            except Exception as e:
+                logging.error(f"Order lookup error for {event_id}: {e}")
+                continue
+
+            doubt['checked_at'] = checked_at
+
+            if placed:
+                self.complete_trade(event_id, placed['orderId'], placed['origQty'], placed['status'])
+                continue
+
+            doubt['not_found'] += 1
+
+            if doubt['not_found'] >= self.lookup_attempts and checked_at - doubt['since'] > self.lookup_grace:
+                self.complete_trade(event_id, None, order['quantity'], 'FAILED')
+
+    async def run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+
+            # On close the exchange may already be gone, the next start resolves them
+            if self.in_doubt and not self._closing:
+                await self.resolve_in_doubt()
+            await self.flush()
+
+    async def flush(self):
+        """
+        Write pending trades in batches on a worker thread. Trades of a
+        failed batch stay pending and are retried on the next flush.
+        """
+        async with self._flush_lock:
+            while self.pending:
+                batch = self.pending[:self.batch_size]
+
+                try:
+                    await asyncio.to_thread(self.database.save_events, batch)
+                except Exception as e:
+                    logging.error(f"Outbox flush error: {e}")
+                    return
+
+                # Trades completed during the write were appended after the batch
+                del self.pending[:len(batch)]
+                self._acknowledge(batch)
+
+    def _acknowledge(self, batch):
+        event_ids = [event['event_id'] for event in batch]
+
+        if self.pending or self.open_trades:
+            self._write({'ack': event_ids})
+        else:
+            # Everything is committed, start the journal over
+            self.journal.truncate(0)
+            self.journal.flush()
+
+        for event_id in event_ids:
+            ack = self.acks.pop(event_id, None)
+            if ack is not None and not ack.done():
+                ack.set_result(event_id)
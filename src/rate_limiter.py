@@ -0,0 +1,164 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+
+# Lower value is served first
+PRIORITY_ORDER = 0
+PRIORITY_DEFAULT = 1
+
+# Binance response headers reporting the usage of each limit
+USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'
+ORDER_COUNT_HEADER = 'X-MBX-ORDER-COUNT-10S'
+
+
+class RateLimitTimeout(Exception):
+    """
+    Raised when a request could not draw from its budgets within its max wait.
+    """
+
+
+class RateLimitBudget:
+    """
+    Token bucket for a single exchange limit, e.g. request weight per minute.
+    """
+    def __init__(self, limit: int, interval: float):
+        self.limit = limit
+        self.interval = interval
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.limit, self.tokens + (now - self.updated_at) * self.limit / self.interval)
+        self.updated_at = now
+
+    def wait_time(self, cost: float):
+        """
+        Seconds until the bucket holds enough tokens for the given cost.
+        """
+        self._refill()
+
+        if self.tokens >= cost:
+            return 0.0
+
+        return (cost - self.tokens) * self.interval / self.limit
+
+    def consume(self, cost: float):
+        self._refill()
+        self.tokens -= cost
+
+    def sync(self, used: int):
+        """
+        Align the bucket with the usage reported by the exchange, which also
+        counts requests made by other clients on the same account or IP.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, self.limit - used)
+
+
+class RateLimiter:
+    """
+    Queues requests until every budget they draw from has room.
+    Waiting requests are served by priority, then in arrival order.
+    """
+    def __init__(self, weight_limit: int, order_limit: int):
+        self.budgets = {
+            'weight': RateLimitBudget(weight_limit, 60),
+            'orders': RateLimitBudget(order_limit, 10),
+        }
+        self.headers = {
+            'weight': USED_WEIGHT_HEADER,
+            'orders': ORDER_COUNT_HEADER,
+        }
+        self.paused_until = 0.0
+        self._waiters = []
+        self._counter = itertools.count()
+        self._changed = None
+
+    def _wait_time(self, costs: dict):
+        wait = max(self.paused_until - time.monotonic(), 0.0)
+
+        for name, cost in costs.items():
+            wait = max(wait, self.budgets[name].wait_time(cost))
+
+        return wait
+
+    def _notify(self):
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def _wait(self, timeout):
+        if self._changed is None:
+            self._changed = asyncio.Event()
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def acquire(self, priority: int = PRIORITY_DEFAULT, weight: int = 1, orders: int = 0, max_wait: float = None):
+        """
+        Wait until the budgets have room for the request and draw from them.
+        With max_wait, give up with RateLimitTimeout as soon as the room is
+        known not to come in time, e.g. during a pause after a 418.
+        """
+        costs = {'weight': weight}
+        if orders:
+            costs['orders'] = orders
+
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        entry = (priority, next(self._counter))
+        heapq.heappush(self._waiters, entry)
+        # A more urgent request may have taken the head of the queue
+        self._notify()
+
+        try:
+            while True:
+                timeout = None
+
+                if self._waiters[0] == entry:
+                    timeout = self._wait_time(costs)
+
+                    if timeout <= 0:
+                        for name, cost in costs.items():
+                            self.budgets[name].consume(cost)
+
+                        heapq.heappop(self._waiters)
+                        self._notify()
+                        return
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0 or (timeout is not None and timeout > remaining):
+                        raise RateLimitTimeout(f"Rate limit budget not available within {max_wait}s")
+
+                    timeout = remaining if timeout is None else timeout
+
+                await self._wait(timeout)
+        except (asyncio.CancelledError, RateLimitTimeout):
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._notify()
+            raise
+
+    def update(self, headers):
+        """
+        Sync the budgets with the usage headers of an exchange response.
+        """
+        for name, header in self.headers.items():
+            used = headers.get(header)
+
+            if used is not None:
+                self.budgets[name].sync(int(used))
+
+    def pause(self, seconds: float):
+        """
+        Hold back every request, e.g. after a 429/418 with Retry-After.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self._notify()
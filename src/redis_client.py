@@ -14,6 +14,12 @@ class RedisManager:
         )
 
         self.client.flushall()
+
+    async def ping(self):
+        self.client.ping()
+
+    async def close(self):
+        self.client.close()
     
     async def set_sma(self, key, value):
         """
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
+from urllib.parse import urlencode
+
+import aiohttp
+
+from config import Config
+from rate_limiter import RateLimiter, RateLimitTimeout, PRIORITY_ORDER, PRIORITY_DEFAULT
+
+
+REST_URL = 'https://api.binance.com'
+REST_TESTNET_URL = 'https://testnet.binance.vision'
+
+# 429: request weight exceeded, 418: IP banned for repeatedly exceeding it
+RATE_LIMIT_STATUSES = (429, 418)
+
+# Error code returned when an order lookup finds no such order
+ORDER_NOT_FOUND_CODE = -2013
+
+
+class BinanceRequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Binance request failed ({status}): {message}")
+        self.status = status
+
+        try:
+            self.code = json.loads(message).get('code')
+        except (ValueError, AttributeError):
+            self.code = None
+
+    @property
+    def rejected(self):
+        """
+        True when the exchange answered that the request was not processed.
+        5xx responses leave the outcome unknown.
+        """
+        return self.status < 500
+
+
+class BinanceRestClient:
+    """
+    Binance REST client sharing one persistent HTTP session.
+
+    Every request first draws from the rate limiter, and the limiter is
+    re-synced from the usage headers of every response.
+    """
+    def __init__(self, api_key: str, api_secret: str, base_url: str = None, limiter: RateLimiter = None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url or (REST_TESTNET_URL if Config.USE_TESTNET else REST_URL)
+        self.limiter = limiter or RateLimiter(Config.REQUEST_WEIGHT_LIMIT, Config.ORDER_COUNT_LIMIT)
+        self.max_retries = Config.REST_MAX_RETRIES
+        self.backoff_base = Config.REST_BACKOFF_BASE
+        self.order_max_wait = Config.ORDER_MAX_WAIT
+        self.session = None
+
+    async def connect(self):
+        self.session = aiohttp.ClientSession(
+            headers={'X-MBX-APIKEY': self.api_key or ''},
+            timeout=aiohttp.ClientTimeout(total=Config.REST_TIMEOUT)
+        )
+
+    async def close(self):
+        await self.session.close()
+
+    def _sign(self, params: dict):
+        # An explicit recvWindow bounds how late the exchange may still act on a request
+        params = dict(params, recvWindow=Config.REST_RECV_WINDOW, timestamp=int(time.time() * 1000))
+        query = urlencode(params)
+        params['signature'] = hmac.new(
+            self.api_secret.encode(),
+            query.encode(),
+            hashlib.sha256
+        ).hexdigest()
+        return params
+
+    def _backoff(self, attempt: int):
+        # Full jitter keeps retries from several tasks from lining up
+        return random.uniform(0, self.backoff_base * 2 ** attempt)
+
+    async def request(self, method: str, path: str, params: dict = None, signed: bool = False,
+                      weight: int = 1, orders: int = 0, priority: int = PRIORITY_DEFAULT, max_wait: float = None):
+        """
+        Send a request, retrying with jittered backoff.
+
+        Rate-limited requests are always retried since the exchange rejected
+        them unprocessed. Network and server errors are only retried for GET,
+        as a retried order could be executed twice. With max_wait, a request
+        not sent within that many seconds is given up as a 429, unsent.
+        """
+        params = params or {}
+        retry_failures = method == 'GET'
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.limiter.acquire(
+                    priority, weight, orders,
+                    max_wait=None if deadline is None else deadline - time.monotonic()
+                )
+            except RateLimitTimeout as e:
+                raise BinanceRequestError(429, str(e))
+
+            query = self._sign(params) if signed else params
+
+            try:
+                async with self.session.request(method, self.base_url + path, params=query) as resp:
+                    self.limiter.update(resp.headers)
+
+                    if resp.status in RATE_LIMIT_STATUSES:
+                        retry_after = float(resp.headers.get('Retry-After', 0))
+                        self.limiter.pause(retry_after)
+                        error = BinanceRequestError(resp.status, await resp.text())
+                    elif resp.status >= 500 and retry_failures:
+                        error = BinanceRequestError(resp.status, await resp.text())
+                    elif resp.status >= 400:
+                        raise BinanceRequestError(resp.status, await resp.text())
+                    else:
+                        return await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not retry_failures:
+                    raise
+                error = e
+
+            logging.warning(f"{method} {path} attempt {attempt + 1} failed: {error}")
+            await asyncio.sleep(self._backoff(attempt))
+
+        raise error
+
+    async def create_market_order(self, symbol: str, side: str, quantity: float, client_order_id: str = None):
+        params = {'symbol': symbol, 'side': side, 'type': 'MARKET', 'quantity': quantity}
+        if client_order_id:
+            params['newClientOrderId'] = client_order_id
+
+        return await self.request(
+            'POST',
+            '/api/v3/order',
+            params,
+            signed=True,
+            orders=1,
+            priority=PRIORITY_ORDER,
+            # A market order sent late trades on a stale signal
+            max_wait=self.order_max_wait
+        )
+
+    async def ping(self):
+        return await self.request('GET', '/api/v3/ping')
+
+    async def get_order(self, symbol: str, client_order_id: str):
+        """
+        Look up an order by its client order id, None if it does not exist.
+        """
+        try:
+            return await self.request(
+                'GET',
+                '/api/v3/order',
+                {'symbol': symbol, 'origClientOrderId': client_order_id},
+                signed=True,
+                weight=4,
+                priority=PRIORITY_ORDER
+            )
+        except BinanceRequestError as e:
+            if e.code == ORDER_NOT_FOUND_CODE:
+                return None
+            raise
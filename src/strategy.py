@@ -3,7 +3,10 @@ import logging
 from config import Config
 from database import Database
 from exchange import BinanceExchange
+from indicators import IndicatorEngine, SMA
+from outbox import Outbox
 from redis_client import RedisManager
+from rest_client import BinanceRequestError
 from utils import monitor_operation
 
 class SMAStrategy:
@@ -11,23 +14,43 @@ class SMAStrategy:
     BUY signals when the short-term average crosses above the long-term average, 
     and SELL signals when it crosses below
     """
-    def __init__(self, database: Database, exchange: BinanceExchange, redis: RedisManager):
+    def __init__(self, database: Database, exchange: BinanceExchange, redis: RedisManager, outbox: Outbox, indicators: IndicatorEngine = None):
         self.database = database
         self.exchange = exchange
         self.redis = redis
+        self.outbox = outbox
+        # Latest signal, known before the outbox has committed it
+        self.last_signal = None
         self.short_period = Config.SHORT_TERM_PERIOD
         self.long_period = Config.LONG_TERM_PERIOD
         self.order_quantity = Config.ORDER_QUANTITY
         self.strategy_time_interval = Config.STRATEGY_TIME_INTERVAL
 
+        # Averages are maintained by the indicator engine on every tick
+        self.indicators = indicators or IndicatorEngine()
+        self.indicators.register(f"sma_{self.short_period}", SMA, period=self.short_period)
+        self.indicators.register(f"sma_{self.long_period}", SMA, period=self.long_period)
+        self.indicators.subscribe(self.on_indicators)
+        self.indicator_values = {}
+
+    def on_indicators(self, symbol: str, values: dict):
+        self.indicator_values[symbol] = values
+
     @monitor_operation("process_price")
     async def process_price(self, symbol: str, price: float):
         await self.database.save_price(symbol, price)
         await self.redis.set_price(symbol, price)
+        self.indicators.update(symbol, price)
 
 
     @monitor_operation("sma_calculation")
     async def calculate_sma(self, period):
+        sma = self.indicator_values.get(Config.TRADING_PAIR, {}).get(f"sma_{period}")
+
+        if sma is not None:
+            return sma
+
+        # Fall back to Redis until the in-memory window has warmed up
         cached_sma = await self.redis.get(f"{Config.TRADING_PAIR}:{period}")
 
         if not cached_sma:
@@ -42,7 +65,7 @@ class SMAStrategy:
         """
         Signal generation for sma crossover
         """
-        last_signal = await self.database.select("*", "signals", "LIMIT 1", return_single=True)
+        last_signal = self.last_signal or await self.database.select("*", "signals", "LIMIT 1", return_single=True)
         current_price = await self.database.select("price", "prices", "LIMIT 1", return_single=True)
         short_sma = await self.calculate_sma(self.short_period)
         long_sma = await self.calculate_sma(self.long_period)
@@ -69,28 +92,29 @@ class SMAStrategy:
             else:
                 return
             
-        await self.database.save_signal(Config.TRADING_PAIR, signal_type, current_price['price'], short_sma, long_sma)
+        # The signal and the order intent are journaled before the order is
+        # placed, and the outbox writes both with the order's outcome
+        trade_id = self.outbox.begin_trade(Config.TRADING_PAIR, signal_type, current_price['price'], short_sma, long_sma, self.order_quantity)
+        self.last_signal = {'signal_type': signal_type}
         logging.info(f"Generated {signal_type} signal at price {current_price['price']}")
 
-        # Execute trade based on signal
+        # Execute trade based on signal, the trade id lets recovery find the order
         try:
-            if signal_type == "BUY":
-                order = await self.exchange.create_market_order(
-                    symbol=Config.TRADING_PAIR,
-                    side=signal_type,
-                    quantity=self.order_quantity
-                )
-            elif signal_type == "SELL":
-                order = await self.exchange.create_market_order(
-                    symbol=Config.TRADING_PAIR,
-                    side=signal_type,
-                    quantity=self.order_quantity
-                )
-              
-            await self.database.save_order(order['orderId'], Config.TRADING_PAIR, signal_type, order['origQty'], current_price['price'], order['status'])
-            logging.info(f"Created {signal_type} order at {current_price['price']} price.")
+            order = await self.exchange.create_market_order(
+                symbol=Config.TRADING_PAIR,
+                side=signal_type,
+                quantity=self.order_quantity,
+                client_order_id=trade_id
+            )
         except Exception as e:
-            logging.error(f"Failed to execute order: {str(e)}")
-        
+            if isinstance(e, BinanceRequestError) and e.rejected:
+                self.outbox.complete_trade(trade_id, None, self.order_quantity, 'REJECTED')
+                logging.error(f"{signal_type} order for the signal at {current_price['price']} price was rejected: {str(e)}")
+            else:
+                # The order may still have been placed, the outbox looks it up
+                self.outbox.defer_trade(trade_id)
+                logging.error(f"Outcome of {signal_type} order {trade_id} is unknown: {str(e)}")
+            return
 
-    
\ No newline at end of file
+        self.outbox.complete_trade(trade_id, order['orderId'], order['origQty'], order['status'])
+        logging.info(f"Created {signal_type} order at {current_price['price']} price.")
@@ -39,6 +39,18 @@ DATA_LOSS_COUNTER = Counter(
     ['operation_name']
 )
 
+STARTUP_DURATION = Gauge(
+    'startup_duration_seconds',
+    'Time spent building an application resource at startup',
+    ['resource']
+)
+
+IMPORT_DURATION = Gauge(
+    'import_duration_seconds',
+    'Time spent importing a module',
+    ['module']
+)
+
 def monitor_operation(operation_name):
     """
     Decorator to monitor operation performance and resource usage
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+import sys
+import os
+
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.container import AppContainer
+
+
+class TestAppContainer:
+    @pytest.mark.asyncio
+    async def test_resource_built_once(self):
+        """Test concurrent requests share a single build"""
+        container = AppContainer()
+        builds = []
+
+        async def factory():
+            builds.append(1)
+            await asyncio.sleep(0)
+            return object()
+
+        first, second = await asyncio.gather(
+            container._resource('database', factory),
+            container._resource('database', factory)
+        )
+
+        assert first is second
+        assert len(builds) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_build_is_retried(self):
+        """Test a failed build is not cached"""
+        container = AppContainer()
+
+        async def failing_factory():
+            raise ConnectionError("unreachable")
+
+        async def factory():
+            return "redis"
+
+        with pytest.raises(ConnectionError):
+            await container._resource('redis', failing_factory)
+
+        assert await container._resource('redis', factory) == "redis"
+
+    @pytest.mark.asyncio
+    async def test_readiness_of_unbuilt_resources(self):
+        """Test resources that were never built are not ready"""
+        container = AppContainer()
+
+        assert await container.readiness() == {
+            'database': False,
+            'redis': False,
+            'exchange': False
+        }
+
+    @pytest.mark.asyncio
+    async def test_schema_set_up_by_one_connection(self, monkeypatch):
+        """Test the outbox connection opens after the main one and skips the schema setup"""
+        connections = []
+
+        class Database:
+            def __init__(self, create_tables=True):
+                connections.append(create_tables)
+
+        monkeypatch.setitem(sys.modules, 'database', type(sys)('database'))
+        sys.modules['database'].Database = Database
+        container = AppContainer()
+
+        await asyncio.gather(container.outbox_database(), container.database())
+
+        assert connections == [True, False]
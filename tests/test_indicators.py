@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.indicators import IndicatorEngine, WindowedIndicator, SMA, EMA, WMA, VWAP, BollingerBands
+
+
+PERIOD = 5
+
+# Absolute tolerance: prices near 65000 with sub-cent tick noise
+TOLERANCE = 1e-8
+
+
+def reference_values(prices, volumes):
+    window = np.array(prices[-PERIOD:])
+    window_volumes = np.array(volumes[-PERIOD:])
+
+    ema = prices[0]
+    for price in prices[1:]:
+        ema += 2 / (PERIOD + 1) * (price - ema)
+
+    return {
+        'sma': window.mean(),
+        'ema': ema,
+        'wma': np.dot(np.arange(1, PERIOD + 1), window) / (PERIOD * (PERIOD + 1) / 2),
+        'vwap': np.dot(window, window_volumes) / window_volumes.sum(),
+        'bands': 2 * window.std(),
+    }
+
+
+def build_engine():
+    engine = IndicatorEngine()
+    engine.register('sma', SMA, period=PERIOD)
+    engine.register('ema', EMA, period=PERIOD)
+    engine.register('wma', WMA, period=PERIOD)
+    engine.register('vwap', VWAP, period=PERIOD)
+    engine.register('bands', BollingerBands, period=PERIOD)
+    return engine
+
+
+def engine_values(engine, symbol):
+    values = engine.values(symbol)
+    values['bands'] = values['bands']['upper'] - values['bands']['middle']
+    return values
+
+
+class TestIndicatorEngine:
+    @pytest.fixture
+    def ticks(self):
+        rng = np.random.default_rng(7)
+        prices = (65000 + np.cumsum(rng.normal(0, 0.01, 40))).tolist()
+        volumes = rng.uniform(0.1, 2, 40).tolist()
+        return prices, volumes
+
+    def test_warm_up(self):
+        """Test indicators report None until their window is full"""
+        engine = build_engine()
+
+        for price in [1.0, 2.0, 3.0, 4.0]:
+            engine.update('BTCUSDT', price)
+
+        assert engine.values('BTCUSDT')['sma'] is None
+
+        engine.update('BTCUSDT', 5.0)
+
+        assert engine.values('BTCUSDT')['sma'] == 3.0
+
+    def test_incremental_updates(self, ticks):
+        """Test per-tick updates match a full recomputation"""
+        prices, volumes = ticks
+        engine = build_engine()
+
+        for price, volume in zip(prices, volumes):
+            engine.update('BTCUSDT', price, volume)
+
+        expected = reference_values(prices, volumes)
+        for name, value in engine_values(engine, 'BTCUSDT').items():
+            assert value == pytest.approx(expected[name], rel=0, abs=TOLERANCE), name
+
+    @pytest.mark.parametrize("batch_threshold", [1, 32])
+    def test_batch_updates(self, ticks, batch_threshold):
+        """Test vectorized and small batches match per-tick updates"""
+        prices, volumes = ticks
+        engine = build_engine()
+        engine.batch_threshold = batch_threshold
+
+        engine.update_batch('BTCUSDT', prices[:3], volumes[:3])
+        for price, volume in zip(prices[3:20], volumes[3:20]):
+            engine.update('BTCUSDT', price, volume)
+        engine.update_batch('BTCUSDT', prices[20:], volumes[20:])
+
+        expected = reference_values(prices, volumes)
+        for name, value in engine_values(engine, 'BTCUSDT').items():
+            assert value == pytest.approx(expected[name], rel=0, abs=TOLERANCE), name
+
+    @pytest.mark.parametrize("batched", [False, True])
+    def test_bollinger_precision_over_long_run(self, batched):
+        """Test band width stays exact over many BTC-like ticks"""
+        rng = np.random.default_rng(11)
+        prices = (65000 + np.cumsum(rng.normal(0, 0.01, 200000))).tolist()
+        engine = IndicatorEngine()
+        engine.register('bands', BollingerBands, period=20)
+        engine.register('wma', WMA, period=20)
+
+        if batched:
+            for start in range(0, len(prices), 500):
+                engine.update_batch('BTCUSDT', prices[start:start + 500])
+        else:
+            for price in prices:
+                engine.update('BTCUSDT', price)
+
+        window = np.array(prices[-20:])
+        values = engine.values('BTCUSDT')
+        bands = values['bands']
+
+        assert bands['upper'] - bands['middle'] == pytest.approx(2 * window.std(), rel=0, abs=TOLERANCE)
+        assert values['wma'] == pytest.approx(np.dot(np.arange(1, 21), window) / 210, rel=0, abs=TOLERANCE)
+
+    def test_late_registration_is_seeded(self, ticks):
+        """Test an indicator registered after ticks arrived is seeded from the window"""
+        prices, volumes = ticks
+        engine = IndicatorEngine()
+        engine.register('sma_10', SMA, period=10)
+
+        for price in prices:
+            engine.update('BTCUSDT', price)
+
+        engine.register('sma_5', SMA, period=PERIOD)
+        engine.update('BTCUSDT', prices[-1])
+
+        assert engine.values('BTCUSDT')['sma_5'] == pytest.approx(np.mean(prices[-4:] + prices[-1:]))
+
+    def test_incomplete_indicator_rejected_on_register(self):
+        """Test an indicator missing a method fails when registered, not on the first tick"""
+        class Incomplete(WindowedIndicator):
+            def step(self, price, volume, leaving, window):
+                pass
+
+            def value(self):
+                return None
+
+        engine = IndicatorEngine()
+
+        with pytest.raises(TypeError):
+            engine.register('incomplete', Incomplete, period=5)
+
+        assert 'incomplete' not in engine.specs
+
+    def test_subscribers_receive_values(self):
+        """Test subscribers are called with every indicator value"""
+        engine = IndicatorEngine()
+        engine.register('sma', SMA, period=1)
+        received = []
+        engine.subscribe(lambda symbol, values: received.append((symbol, values)))
+
+        engine.update('ETHUSDT', 10.0)
+
+        assert received == [('ETHUSDT', {'sma': 10.0})]
@@ -0,0 +1,36 @@
+import json
+import sys
+import os
+
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.market_data import parse_best_bid_ask
+
+
+class TestParseBestBidAsk:
+    def test_partial_depth_frame(self):
+        """Test best levels are read from a partial depth frame"""
+        frame = json.dumps({
+            "lastUpdateId": 160,
+            "bids": [["50000.10", "1.5"], ["49999.90", "2"]],
+            "asks": [["50000.30", "0.5"], ["50000.50", "3"]],
+        }, separators=(',', ':'))
+
+        assert parse_best_bid_ask(frame) == (50000.10, 50000.30)
+
+    def test_fallback_to_json(self):
+        """Test frames with a different layout are decoded as JSON"""
+        frame = json.dumps({
+            "stream": "btcusdt@depth5",
+            "data": {"bids": [["1.5", "1"]], "asks": [["2.5", "1"]]},
+        })
+
+        assert parse_best_bid_ask(frame) == (1.5, 2.5)
+
+    def test_empty_side(self):
+        """Test an empty book side returns None"""
+        frame = '{"lastUpdateId":1,"bids":[],"asks":[["2.5","1"]]}'
+
+        assert parse_best_bid_ask(frame) is None
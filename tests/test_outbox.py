@@ -0,0 +1,187 @@
+import json
+import pytest
+from unittest.mock import Mock, AsyncMock
+import sys
+import os
+
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.outbox import Outbox
+
+
+class TestOutbox:
+    @pytest.fixture
+    async def outbox_setup(self, tmp_path):
+        """Setup outbox over a mocked database and a temporary journal"""
+        database = Mock()
+
+        outbox = Outbox(database, journal_path=str(tmp_path / "outbox.journal"))
+        outbox.flush_interval = 60
+        await outbox.start()
+
+        yield outbox, database
+
+        await outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_trades_committed_in_one_batch(self, outbox_setup):
+        """Test completed trades are written together and acknowledged"""
+        outbox, database = outbox_setup
+
+        buy = outbox.begin_trade('BTCUSDT', 'BUY', 50000.0, 51000.0, 49000.0, 0.001)
+        sell = outbox.begin_trade('BTCUSDT', 'SELL', 50100.0, 49000.0, 51000.0, 0.001)
+        buy_ack = outbox.complete_trade(buy, 1, '0.001', 'FILLED')
+        sell_ack = outbox.complete_trade(sell, 2, '0.001', 'FILLED')
+
+        assert not buy_ack.done()
+
+        await outbox.flush()
+
+        database.save_events.assert_called_once()
+        batch = database.save_events.call_args[0][0]
+        assert [event['event_id'] for event in batch] == [buy, sell]
+        assert batch[0]['payload']['signal']['signal_type'] == 'BUY'
+        assert batch[0]['payload']['order']['order_id'] == 1
+        assert buy_ack.result() == buy
+        assert sell_ack.result() == sell
+        assert os.path.getsize(outbox.journal_path) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_placement_written_with_signal(self, outbox_setup):
+        """Test a rejected order is written in the same batch as its signal"""
+        outbox, database = outbox_setup
+
+        trade = outbox.begin_trade('BTCUSDT', 'BUY', 50000.0, 51000.0, 49000.0, 0.001)
+        outbox.complete_trade(trade, None, 0.001, 'REJECTED')
+
+        await outbox.flush()
+
+        event, = database.save_events.call_args[0][0]
+        assert event['event_id'] == trade
+        assert event['payload']['signal']['price'] == 50000.0
+        assert event['payload']['order']['order_id'] is None
+        assert event['payload']['order']['status'] == 'REJECTED'
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self, outbox_setup):
+        """Test trades stay pending when the batch commit fails"""
+        outbox, database = outbox_setup
+        database.save_events.side_effect = [ConnectionError("database unavailable"), None]
+
+        trade = outbox.begin_trade('BTCUSDT', 'SELL', 50000.0, 49000.0, 51000.0, 0.001)
+        ack = outbox.complete_trade(trade, 1, '0.001', 'FILLED')
+
+        await outbox.flush()
+        assert not ack.done()
+        assert len(outbox.pending) == 1
+
+        await outbox.flush()
+        assert ack.done()
+        assert outbox.pending == []
+
+    @pytest.mark.asyncio
+    async def test_crash_after_placement_recovered_from_exchange(self, tmp_path):
+        """Test an intent without an outcome is completed from the exchange order"""
+        journal_path = str(tmp_path / "outbox.journal")
+        database = Mock()
+
+        crashed = Outbox(database, journal_path=journal_path)
+        await crashed.start()
+        trade = crashed.begin_trade('BTCUSDT', 'BUY', 50000.0, 51000.0, 49000.0, 0.001)
+        # The order is placed, then the process dies before its outcome is journaled
+        crashed._task.cancel()
+        crashed.journal.close()
+
+        order_lookup = AsyncMock(return_value={'orderId': 7, 'origQty': '0.001', 'status': 'FILLED'})
+        outbox = Outbox(database, journal_path=journal_path, order_lookup=order_lookup)
+        await outbox.start()
+        await outbox.close()
+
+        order_lookup.assert_called_once_with('BTCUSDT', trade)
+        event, = database.save_events.call_args[0][0]
+        assert event['event_id'] == trade
+        assert event['payload']['order']['order_id'] == 7
+        assert event['payload']['order']['status'] == 'FILLED'
+        assert event['payload']['signal']['signal_type'] == 'BUY'
+
+    @pytest.mark.asyncio
+    async def test_order_unknown_after_timeout_not_failed(self, tmp_path):
+        """Test a single "not found" after a timed out request does not fail the trade"""
+        database = Mock()
+        order_lookup = AsyncMock(side_effect=[None, {'orderId': 7, 'origQty': '0.001', 'status': 'FILLED'}])
+        outbox = Outbox(database, journal_path=str(tmp_path / "outbox.journal"), order_lookup=order_lookup)
+        outbox.lookup_interval = 0
+        await outbox.start()
+
+        trade = outbox.begin_trade('BTCUSDT', 'BUY', 50000.0, 51000.0, 49000.0, 0.001)
+        # However long the request waited and timed out, the grace period starts here
+        outbox.defer_trade(trade)
+
+        await outbox.resolve_in_doubt()
+        assert trade in outbox.in_doubt
+        database.save_events.assert_not_called()
+
+        # The exchange was still processing the order at the first lookup
+        await outbox.resolve_in_doubt()
+        await outbox.close()
+
+        event, = database.save_events.call_args[0][0]
+        assert event['payload']['order']['status'] == 'FILLED'
+
+    @pytest.mark.asyncio
+    async def test_unplaced_order_marked_failed(self, tmp_path):
+        """Test an order the exchange keeps not knowing past the grace period is written as FAILED"""
+        database = Mock()
+        order_lookup = AsyncMock(return_value=None)
+        outbox = Outbox(database, journal_path=str(tmp_path / "outbox.journal"), order_lookup=order_lookup)
+        outbox.lookup_interval = 0
+        await outbox.start()
+
+        trade = outbox.begin_trade('BTCUSDT', 'BUY', 50000.0, 51000.0, 49000.0, 0.001)
+        outbox.defer_trade(trade)
+
+        await outbox.resolve_in_doubt()
+        assert trade in outbox.in_doubt
+
+        # Past the grace period a single lookup is still not enough
+        outbox.lookup_grace = 0
+        outbox.in_doubt[trade]['not_found'] = 0
+        await outbox.resolve_in_doubt()
+        assert trade in outbox.in_doubt
+
+        await outbox.resolve_in_doubt()
+        await outbox.close()
+
+        assert order_lookup.call_count == 3
+        event, = database.save_events.call_args[0][0]
+        assert event['payload']['order']['status'] == 'FAILED'
+        assert outbox.in_doubt == {}
+
+    @pytest.mark.asyncio
+    async def test_unacknowledged_trades_replayed(self, tmp_path):
+        """Test recovery replays only completed trades without an acknowledgement"""
+        journal_path = tmp_path / "outbox.journal"
+        trades = [
+            {'event_id': event_id, 'kind': 'trade', 'payload': {'signal': {}, 'order': {'symbol': 'BTCUSDT'}}}
+            for event_id in ['a', 'b', 'c']
+        ]
+        with open(journal_path, 'w') as journal:
+            for trade in trades:
+                journal.write(json.dumps(trade) + '\n')
+            journal.write(json.dumps({'outcome': 'a', 'order': {'status': 'FILLED'}}) + '\n')
+            journal.write(json.dumps({'outcome': 'b', 'order': {'status': 'FILLED'}}) + '\n')
+            journal.write(json.dumps({'ack': ['a']}) + '\n')
+            journal.write('{"outcome": "c", "or')
+
+        database = Mock()
+        outbox = Outbox(database, journal_path=str(journal_path))
+
+        await outbox.start()
+        await outbox.close()
+
+        event, = database.save_events.call_args[0][0]
+        assert event['event_id'] == 'b'
+        assert event['payload']['order'] == {'symbol': 'BTCUSDT', 'status': 'FILLED'}
+        assert list(outbox.in_doubt) == ['c']
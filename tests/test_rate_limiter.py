@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+import sys
+import os
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from src.rate_limiter import RateLimiter, RateLimitBudget, PRIORITY_ORDER, PRIORITY_DEFAULT
+from src.rest_client import BinanceRestClient, BinanceRequestError
+# The limiter as the REST client sees it, src modules import each other top-level
+from src.rest_client import RateLimiter as ClientRateLimiter
+
+
+class TestRateLimiter:
+    def test_budget_sync_with_reported_usage(self):
+        """Test usage reported by the exchange drains the bucket"""
+        budget = RateLimitBudget(limit=1200, interval=60)
+        budget.sync(1190)
+
+        assert budget.wait_time(10) == 0
+        assert budget.wait_time(20) > 0
+
+    @pytest.mark.asyncio
+    async def test_orders_served_before_other_requests(self):
+        """Test queued orders are served ahead of earlier lower priority requests"""
+        limiter = RateLimiter(weight_limit=600, order_limit=100)
+        limiter.budgets['weight'].tokens = 0
+        served = []
+
+        async def request(name, priority):
+            await limiter.acquire(priority, weight=1)
+            served.append(name)
+
+        ping = asyncio.ensure_future(request('ping', PRIORITY_DEFAULT))
+        await asyncio.sleep(0)
+        order = asyncio.ensure_future(request('order', PRIORITY_ORDER))
+
+        await asyncio.gather(ping, order)
+
+        assert served == ['order', 'ping']
+
+
+class TestBinanceRestClient:
+    @pytest.fixture
+    async def stand_in(self):
+        """Local stand-in for the Binance REST API"""
+        calls = []
+
+        async def order(request):
+            calls.append(request.query)
+
+            if len(calls) == 1:
+                return web.json_response({'code': -1003}, status=429, headers={'Retry-After': '0'})
+
+            return web.json_response(
+                {'orderId': 1, 'origQty': request.query['quantity'], 'status': 'FILLED'},
+                headers={'X-MBX-USED-WEIGHT-1M': '1150', 'X-MBX-ORDER-COUNT-10S': '3'}
+            )
+
+        async def rejected(request):
+            calls.append(request.query)
+            return web.json_response({'code': -2010}, status=400)
+
+        app = web.Application()
+        app.router.add_post('/api/v3/order', order)
+        app.router.add_post('/api/v3/rejected', rejected)
+
+        server = TestServer(app)
+        await server.start_server()
+
+        limiter = ClientRateLimiter(weight_limit=1200, order_limit=50)
+        client = BinanceRestClient('key', 'secret', base_url=str(server.make_url('')).rstrip('/'), limiter=limiter)
+        client.backoff_base = 0
+        await client.connect()
+
+        yield client, calls
+
+        await client.close()
+        await server.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_after_rate_limit(self, stand_in):
+        """Test a 429 is retried and usage headers sync the budgets"""
+        client, calls = stand_in
+
+        order = await client.create_market_order('BTCUSDT', 'BUY', 0.001)
+
+        assert order['orderId'] == 1
+        assert len(calls) == 2
+        assert 'signature' in calls[1]
+        assert client.limiter.budgets['weight'].tokens < 60
+        assert client.limiter.budgets['orders'].tokens < 48
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self, stand_in):
+        """Test rejected orders raise without being retried"""
+        client, calls = stand_in
+
+        with pytest.raises(BinanceRequestError):
+            await client.request('POST', '/api/v3/rejected', signed=True, orders=1, priority=PRIORITY_ORDER)
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_order_given_up_during_ban(self, stand_in):
+        """Test an order that cannot be sent in time is rejected unsent"""
+        client, calls = stand_in
+        client.order_max_wait = 0.1
+        # Retry-After of a 418 ban
+        client.limiter.pause(3600)
+
+        with pytest.raises(BinanceRequestError) as error:
+            await asyncio.wait_for(client.create_market_order('BTCUSDT', 'BUY', 0.001), 1)
+
+        assert error.value.rejected
+        assert calls == []
+        assert client.limiter._waiters == []
@@ -16,7 +16,8 @@ class MockConfig:
 
 # Import strategy after setting up MockConfig
 with patch('src.config.Config', MockConfig):
-    from src.strategy import SMAStrategy
+    # The error class as the strategy module sees it, src modules import each other top-level
+    from src.strategy import SMAStrategy, BinanceRequestError
 
 class TestSMAStrategy:
     @pytest.fixture
@@ -25,17 +26,18 @@ class TestSMAStrategy:
         database = Mock()
         exchange = Mock()
         redis = Mock()
+        outbox = Mock()
         
         # Setup async mocks
         database.save_price = AsyncMock()
-        database.save_signal = AsyncMock()
         database.select = AsyncMock()
         redis.set_price = AsyncMock()
         redis.get = AsyncMock()
         redis.calculate_sma = AsyncMock()
         exchange.create_market_order = AsyncMock()
+        outbox.begin_trade.return_value = 'trade-1'
         
-        strategy = SMAStrategy(database, exchange, redis)
+        strategy = SMAStrategy(database, exchange, redis, outbox)
         return strategy, database, exchange, redis
 
     @pytest.mark.asyncio
@@ -76,10 +78,12 @@ class TestSMAStrategy:
         
         await strategy.generate_signal()
         
-        database.save_signal.assert_called_once()
-        call_args = database.save_signal.call_args[0]
+        strategy.outbox.begin_trade.assert_called_once()
+        call_args = strategy.outbox.begin_trade.call_args[0]
         assert call_args[1] == "BUY"
         exchange.create_market_order.assert_called_once()
+        assert exchange.create_market_order.call_args[1]['client_order_id'] == 'trade-1'
+        strategy.outbox.complete_trade.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_generate_sell_signal(self, strategy_setup):
@@ -95,7 +99,35 @@ class TestSMAStrategy:
         await strategy.generate_signal()
         
         # Assert
-        database.save_signal.assert_called_once()
-        call_args = database.save_signal.call_args[0]
+        strategy.outbox.begin_trade.assert_called_once()
+        call_args = strategy.outbox.begin_trade.call_args[0]
         assert call_args[1] == "SELL"
         exchange.create_market_order.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_rejected_order_completes_trade(self, strategy_setup):
+        """Test a rejected order is recorded with the signal as REJECTED"""
+        strategy, database, exchange, _ = strategy_setup
+        
+        database.select.side_effect = [None, {'price': 50000.0}]
+        strategy.calculate_sma = AsyncMock(side_effect=[51000.0, 49000.0])
+        exchange.create_market_order.side_effect = BinanceRequestError(400, '{"code": -2010, "msg": "Account has insufficient balance"}')
+        
+        await strategy.generate_signal()
+        
+        strategy.outbox.complete_trade.assert_called_once_with('trade-1', None, strategy.order_quantity, 'REJECTED')
+        strategy.outbox.defer_trade.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_order_outcome_deferred(self, strategy_setup):
+        """Test an order without an answer is left for the outbox to look up"""
+        strategy, database, exchange, _ = strategy_setup
+        
+        database.select.side_effect = [None, {'price': 50000.0}]
+        strategy.calculate_sma = AsyncMock(side_effect=[51000.0, 49000.0])
+        exchange.create_market_order.side_effect = ConnectionError("connection reset")
+        
+        await strategy.generate_signal()
+        
+        strategy.outbox.defer_trade.assert_called_once_with('trade-1')
+        strategy.outbox.complete_trade.assert_not_called()